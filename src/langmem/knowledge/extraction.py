@@ -1,14 +1,29 @@
 import asyncio
+import functools
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import os
 import typing
 import uuid
 
 from langchain.chat_models import init_chat_model
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import AIMessage, AnyMessage
+from langchain_core.messages import AIMessage, AnyMessage, ToolCall
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.prompts.string import get_template_variables
 from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
 from langchain_core.runnables.config import get_executor_for_config
-from langgraph.store.base import BaseStore, SearchItem
+from langchain_core.runnables.utils import gather_with_concurrency
+from langgraph.store.base import (
+    BaseStore,
+    PutOp,
+    SearchItem,
+    SearchOp,
+    _validate_namespace,
+)
 from langgraph.utils.config import get_store
 from pydantic import BaseModel, Field
 from trustcall import create_extractor
@@ -17,6 +32,8 @@ from typing_extensions import TypedDict
 from langmem import utils
 from langmem.knowledge.tools import create_search_memory_tool
 
+logger = logging.getLogger(__name__)
+
 ## LangGraph Tools
 
 
@@ -42,6 +59,20 @@ class ExtractedMemory(typing.NamedTuple):
 S = typing.TypeVar("S", bound=BaseModel)
 
 
+@functools.lru_cache(maxsize=32)
+def _get_model(model: str) -> BaseChatModel:
+    """Initialize a chat model by name, sharing one instance (and client) per name."""
+    return init_chat_model(model)
+
+
+def _new_ids(n: int) -> list[str]:
+    """Generate `n` random (version 4) UUIDs from a single urandom read."""
+    raw = os.urandom(16 * n)
+    return [
+        str(uuid.UUID(bytes=raw[i : i + 16], version=4)) for i in range(0, 16 * n, 16)
+    ]
+
+
 class Memory(BaseModel):
     """Call this tool once for each new memory you want to record. Use multi-tool calling to record multiple new memories."""
 
@@ -117,27 +148,37 @@ def create_thread_extractor(
     if schema is None:
         schema = SummarizeThread
 
-    extractor = create_extractor(model, tools=[schema], tool_choice="any")
+    extractor = create_extractor(
+        _get_model(model) if isinstance(model, str) else model,
+        tools=[schema],
+        tool_choice="any",
+    )
 
-    template = ChatPromptTemplate.from_messages(
-        [
-            ("system", instructions),
-            (
-                "user",
-                "Call the provided tool based on the conversation below:\n\n<conversation>{conversation}</conversation>",
-            ),
-        ]
+    # Instructions are an f-string template over `conversation` and any extra input
+    # keys; format them once up front unless they actually reference one.
+    system_prompt = (
+        None
+        if get_template_variables(instructions, "f-string")
+        else instructions.format()
     )
 
-    def merge_messages(input: dict) -> dict:
+    def format_prompt(input: dict) -> list[dict]:
         conversation = utils.get_conversation(input["messages"])
-
-        return {"conversation": conversation} | {
-            k: v for k, v in input.items() if k != "messages"
-        }
+        system = system_prompt
+        if system is None:
+            extra = {k: v for k, v in input.items() if k != "messages"}
+            system = instructions.format(**{"conversation": conversation, **extra})
+        return [
+            {"role": "system", "content": system},
+            {
+                "role": "user",
+                "content": "Call the provided tool based on the conversation below:\n\n"
+                f"<conversation>{conversation}</conversation>",
+            },
+        ]
 
     return (
-        merge_messages | template | extractor | (lambda out: out["responses"][0])
+        RunnableLambda(format_prompt) | extractor | (lambda out: out["responses"][0])
     ).with_config({"run_name": "thread_extractor"})  # type: ignore
 
 
@@ -184,36 +225,55 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
         enable_updates: bool = True,
         enable_deletes: bool = False,
     ):
-        self.model = (
-            model if isinstance(model, BaseChatModel) else init_chat_model(model)
-        )
+        self.model = model if isinstance(model, BaseChatModel) else _get_model(model)
         self.schemas = schemas or (Memory,)
         self.instructions = instructions
         self.enable_inserts = enable_inserts
         self.enable_updates = enable_updates
         self.enable_deletes = enable_deletes
 
+    def _build_extractor(self, *, with_done: bool = False) -> Runnable:
+        return create_extractor(
+            self.model,
+            tools=list(self.schemas) + ([Done] if with_done else []),
+            enable_inserts=self.enable_inserts,
+            enable_updates=self.enable_updates,
+            enable_deletes=self.enable_deletes,
+            existing_schema_policy=False,
+        )
+
+    @functools.cached_property
+    def _extractor(self) -> Runnable:
+        return self._build_extractor()
+
+    @functools.cached_property
+    def _done_extractor(self) -> Runnable:
+        """Extractor for follow-up steps, which may also call the `Done` tool."""
+        return self._build_extractor(with_done=True)
+
+    @functools.cached_property
+    def _prompt_prefix(self) -> str:
+        """The part of the user prompt that doesn't depend on the conversation."""
+        return (
+            f"{self.instructions}\n\nEnrich, prune, and organize memories based on any new information. "
+            f"If an existing memory is incorrect or outdated, update it based on the new information. "
+            f"All operations must be done in single parallel multi-tool call."
+            f" Avoid duplicate extractions. "
+        )
+
     def _prepare_messages(
         self, messages: list[AnyMessage], max_steps: int = 1
     ) -> list[dict]:
-        id_ = str(uuid.uuid4())
-        session = (
-            f"\n\n<session_{id_}>\n{utils.get_conversation(messages)}\n</session_{id_}>"
-        )
+        # Keep the prompt deterministic so providers can reuse the cached prefix.
+        session = f"\n\n<session>\n{utils.get_conversation(messages)}\n</session>"
         if max_steps > 1:
-            session = f"{session}\n\nYou have a maximum of {max_steps - 1} attempts"
-            " to form and consolidate memories from this session."
+            session = (
+                f"{session}\n\nYou have a maximum of {max_steps - 1} attempts"
+                " to form and consolidate memories from this session."
+            )
         return [
             {"role": "system", "content": "You are a memory subroutine for an AI."},
-            {
-                "role": "user",
-                "content": (
-                    f"{self.instructions}\n\nEnrich, prune, and organize memories based on any new information. "
-                    f"If an existing memory is incorrect or outdated, update it based on the new information. "
-                    f"All operations must be done in single parallel multi-tool call."
-                    f" Avoid duplicate extractions. {session}"
-                ),
-            },
+            {"role": "user", "content": self._prompt_prefix + session},
         ]
 
     def _prepare_existing(
@@ -224,13 +284,14 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
             ]
         ],
     ) -> list[tuple[str, str, typing.Any]]:
-        if existing is None:
+        if not existing:
             return []
-        if all(isinstance(ex, str) for ex in existing):
+        # Inputs are homogeneous (see the annotation), so the first element decides.
+        if isinstance(existing[0], str):
             MemoryModel = self.schemas[0]
             return [
-                (str(uuid.uuid4()), "Memory", MemoryModel(content=ex))
-                for ex in existing
+                (id_, "Memory", MemoryModel(content=ex))
+                for id_, ex in zip(_new_ids(len(existing)), existing)
             ]
         result = []
         for e in existing:
@@ -240,14 +301,14 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
                 # Assume a two-element tuple: (id, value)
                 id_, value = e[0], e[1]
                 kind = (
-                    value.__repr_name__() if isinstance(value, BaseModel) else "__any__"
+                    type(value).__name__ if isinstance(value, BaseModel) else "__any__"
                 )
                 result.append((id_, kind, value))
         return result
 
     @staticmethod
     def _filter_response(
-        memories: list[ExtractedMemory],
+        memories: typing.Iterable[tuple[str, typing.Any]],
         external_ids: set[str],
         exclude_removals: bool = False,
     ) -> list[ExtractedMemory]:
@@ -259,7 +320,7 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
         results = []
         for rid, value in memories:
             is_removal = (
-                hasattr(value, "__repr_name__") and value.__repr_name__() == "RemoveDoc"
+                hasattr(value, "__repr_name__") and type(value).__name__ == "RemoveDoc"
             )
             if exclude_removals:
                 if is_removal:
@@ -268,7 +329,7 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
                 # Final response: if this is a removal *and* its id is not external, skip it.
                 if is_removal and (rid not in external_ids):
                     continue
-            results.append(ExtractedMemory(id=rid, content=value))
+            results.append(ExtractedMemory(rid, value))
         return results
 
     async def ainvoke(
@@ -287,14 +348,7 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
         # Track external memory IDs (those passed in from outside)
         external_ids = {mem_id for mem_id, _, _ in prepared_existing}
 
-        extractor = create_extractor(
-            self.model,
-            tools=list(self.schemas),
-            enable_inserts=self.enable_inserts,
-            enable_updates=self.enable_updates,
-            enable_deletes=self.enable_deletes,
-            existing_schema_policy=False,
-        )
+        extractor = self._extractor
         # initial payload uses the full prepared_existing list
         payload = {"messages": prepared_messages, "existing": prepared_existing}
         # Use a dict to record the latest update for each memory id.
@@ -302,32 +356,33 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
 
         for i in range(max_steps):
             if i == 1:
-                extractor = create_extractor(
-                    self.model,
-                    tools=list(self.schemas) + [Done],
-                    enable_inserts=self.enable_inserts,
-                    enable_updates=self.enable_updates,
-                    enable_deletes=self.enable_deletes,
-                    existing_schema_policy=False,
-                )
+                extractor = self._done_extractor
             response = await extractor.ainvoke(payload)
+            kinds = [
+                type(r).__name__ if hasattr(r, "__repr_name__") else None
+                for r in response["responses"]
+            ]
             is_done = False
             step_results = {}
-            for r, rmeta in zip(response["responses"], response["response_metadata"]):
-                if hasattr(r, "__repr_name__") and r.__repr_name__() == "Done":
+            for r, rmeta, kind in zip(
+                response["responses"], response["response_metadata"], kinds
+            ):
+                if kind == "Done":
                     is_done = True
                     continue
                 mem_id = (
                     r.json_doc_id
-                    if hasattr(r, "__repr_name__") and r.__repr_name__() == "RemoveDoc"
-                    else rmeta.get("json_doc_id", str(uuid.uuid4()))
+                    if kind == "RemoveDoc"
+                    else rmeta.get("json_doc_id") or str(uuid.uuid4())
                 )
                 step_results[mem_id] = r
             results.update(step_results)
 
-            for mem_id, _, mem in prepared_existing:
-                if mem_id not in results:
-                    results[mem_id] = mem
+            # Results only ever grow, so existing memories need merging in once.
+            if i == 0:
+                for mem_id, _, mem in prepared_existing:
+                    if mem_id not in results:
+                        results[mem_id] = mem
 
             ai_msg = response["messages"][-1]
             if is_done or not ai_msg.tool_calls:
@@ -337,16 +392,9 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
                     (
                         "updated"
                         if rmeta.get("json_doc_id")
-                        else (
-                            "deleted"
-                            if hasattr(r, "__repr_name__")
-                            and r.__repr_name__() == "RemoveDoc"
-                            else "inserted"
-                        )
-                    )
-                    for r, rmeta in zip(
-                        response["responses"], response["response_metadata"]
+                        else ("deleted" if kind == "RemoveDoc" else "inserted")
                     )
+                    for rmeta, kind in zip(response["response_metadata"], kinds)
                 ]
                 prepared_messages = (
                     prepared_messages
@@ -358,7 +406,7 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
                             "tool_call_id": tc["id"],
                         }
                         for tc, ((rid, _), action) in zip(
-                            ai_msg.tool_calls, zip(list(step_results.items()), actions)
+                            ai_msg.tool_calls, zip(step_results.items(), actions)
                         )
                     ]
                 )
@@ -366,13 +414,13 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
                 payload = {
                     "messages": prepared_messages,
                     "existing": self._filter_response(
-                        list(results.items()), external_ids, exclude_removals=True
+                        results.items(), external_ids, exclude_removals=True
                     ),
                 }
 
         # For the final response, include removals only if they refer to an external memory.
         return self._filter_response(
-            list(results.items()), external_ids, exclude_removals=False
+            results.items(), external_ids, exclude_removals=False
         )
 
     def invoke(
@@ -391,49 +439,41 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
         # Track external memory IDs (those passed in from outside)
         external_ids = {mem_id for mem_id, _, _ in prepared_existing}
 
-        extractor = create_extractor(
-            self.model,
-            tools=list(self.schemas),
-            enable_inserts=self.enable_inserts,
-            enable_updates=self.enable_updates,
-            enable_deletes=self.enable_deletes,
-            existing_schema_policy=False,
-        )
+        extractor = self._extractor
         payload = {"messages": prepared_messages, "existing": prepared_existing}
         # Use a dict to record the latest update for each memory id.
         results: dict[str, BaseModel] = {}
 
         for i in range(max_steps):
             if i == 1:
-                extractor = create_extractor(
-                    self.model,
-                    tools=list(self.schemas) + [Done],
-                    enable_inserts=self.enable_inserts,
-                    enable_updates=self.enable_updates,
-                    enable_deletes=self.enable_deletes,
-                    existing_schema_policy=False,
-                )
+                extractor = self._done_extractor
             response = extractor.invoke(payload)
+            kinds = [
+                type(r).__name__ if hasattr(r, "__repr_name__") else None
+                for r in response["responses"]
+            ]
             is_done = False
             step_results: dict[str, BaseModel] = {}
-            for r, rmeta in zip(response["responses"], response["response_metadata"]):
-                if hasattr(r, "__repr_name__") and r.__repr_name__() == "Done":
+            for r, rmeta, kind in zip(
+                response["responses"], response["response_metadata"], kinds
+            ):
+                if kind == "Done":
                     is_done = True
                     continue
                 mem_id = (
                     r.json_doc_id
-                    if (
-                        hasattr(r, "__repr_name__") and r.__repr_name__() == "RemoveDoc"
-                    )
-                    else rmeta.get("json_doc_id", str(uuid.uuid4()))
+                    if kind == "RemoveDoc"
+                    else rmeta.get("json_doc_id") or str(uuid.uuid4())
                 )
                 step_results[mem_id] = r
             results.update(step_results)
 
             # Ensure any memory from the initial payload that hasn't been updated is retained.
-            for mem_id, _, mem in prepared_existing:
-                if mem_id not in results:
-                    results[mem_id] = mem
+            # Results only ever grow, so this only needs to happen once.
+            if i == 0:
+                for mem_id, _, mem in prepared_existing:
+                    if mem_id not in results:
+                        results[mem_id] = mem
 
             ai_msg = response["messages"][-1]
             if is_done or not ai_msg.tool_calls:
@@ -443,18 +483,9 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
                     (
                         "updated"
                         if rmeta.get("json_doc_id")
-                        else (
-                            "deleted"
-                            if (
-                                hasattr(r, "__repr_name__")
-                                and r.__repr_name__() == "RemoveDoc"
-                            )
-                            else "inserted"
-                        )
-                    )
-                    for r, rmeta in zip(
-                        response["responses"], response["response_metadata"]
+                        else ("deleted" if kind == "RemoveDoc" else "inserted")
                     )
+                    for rmeta, kind in zip(response["response_metadata"], kinds)
                 ]
                 prepared_messages = (
                     prepared_messages
@@ -466,19 +497,19 @@ class MemoryManager(Runnable[MemoryState, list[ExtractedMemory]]):
                             "tool_call_id": tc["id"],
                         }
                         for tc, ((rid, _), action) in zip(
-                            ai_msg.tool_calls, zip(list(step_results.items()), actions)
+                            ai_msg.tool_calls, zip(step_results.items(), actions)
                         )
                     ]
                 )
                 payload = {
                     "messages": prepared_messages,
                     "existing": self._filter_response(
-                        list(results.items()), external_ids, exclude_removals=True
+                        results.items(), external_ids, exclude_removals=True
                     ),
                 }
 
         return self._filter_response(
-            list(results.items()), external_ids, exclude_removals=False
+            results.items(), external_ids, exclude_removals=False
         )
 
     async def __call__(
@@ -732,9 +763,7 @@ def create_memory_searcher(
     )
 
     # Initialize model and search tool
-    model_instance = (
-        model if isinstance(model, BaseChatModel) else init_chat_model(model)
-    )
+    model_instance = model if isinstance(model, BaseChatModel) else _get_model(model)
     search_tool = create_search_memory_tool(
         namespace=namespace, response_format="content_and_artifact"
     )
@@ -772,11 +801,16 @@ def create_memory_searcher(
     ).with_config({"run_name": "search_memory_pipeline"})
 
 
+# Default cap on concurrent store and phase calls when the config sets no max_concurrency
+_DEFAULT_MAX_CONCURRENCY = 8
+
+
 class MemoryPhase(TypedDict, total=False):
     instructions: str
     include_messages: bool
     enable_inserts: bool
     enable_deletes: bool
+    parallel: bool
 
 
 class MemoryStoreManagerInput(TypedDict):
@@ -786,6 +820,97 @@ class MemoryStoreManagerInput(TypedDict):
     max_steps: int  # Default of 1
 
 
+# Errors that point at a bug (e.g., malformed search arguments) rather than at an
+# unavailable store; a failed search is only skipped for the latter.
+_PROGRAMMING_ERRORS = (TypeError, ValueError, AttributeError)
+
+
+async def _search_or_error(
+    coro: typing.Awaitable[list[SearchItem]],
+) -> typing.Union[list[SearchItem], Exception]:
+    try:
+        return await coro
+    except _PROGRAMMING_ERRORS:
+        raise
+    except Exception as e:
+        return e
+
+
+def _batch_searches(store: BaseStore, ops: list[SearchOp]) -> list[list[SearchItem]]:
+    """Run searches in one batch, retrying them one at a time if the batch fails.
+
+    Like the async path, failed searches are dropped as long as one succeeds.
+    """
+    try:
+        return store.batch(ops)
+    except _PROGRAMMING_ERRORS:
+        raise
+    except Exception:
+        if len(ops) < 2:
+            raise
+    results: list[typing.Union[list[SearchItem], Exception]] = []
+    for op in ops:
+        try:
+            results.append(store.batch([op])[0])
+        except _PROGRAMMING_ERRORS:
+            raise
+        except Exception as e:
+            results.append(e)
+    return _drop_failed_searches(results)
+
+
+def _drop_failed_searches(
+    results: list[typing.Union[list[SearchItem], Exception]],
+) -> list[list[SearchItem]]:
+    """Keep the successful searches, raising only if every search failed."""
+    errors = [r for r in results if isinstance(r, Exception)]
+    if not errors:
+        return results
+    if len(errors) == len(results):
+        raise errors[0]
+    for e in errors:
+        logger.warning("Memory search failed; continuing without it.", exc_info=e)
+    return [r for r in results if not isinstance(r, Exception)]
+
+
+def _search_ops(
+    store: BaseStore, namespace: tuple[str, ...], search_kwargs: list[dict]
+) -> list[SearchOp]:
+    """Express searches as SearchOps so they can run in a single batch.
+
+    Like `BaseStore.search`, reads refresh item TTLs unless the store's TTL
+    config turns that off.
+    """
+    ttl_config = getattr(store, "ttl_config", None)
+    # Only pass `refresh_ttl` for TTL-configured stores: older langgraph-checkpoint
+    # SearchOps have no such field, and it defaults to refreshing anyway.
+    refresh = (
+        {"refresh_ttl": ttl_config.get("refresh_on_read", True)} if ttl_config else {}
+    )
+    return [SearchOp(namespace, **refresh, **kwargs) for kwargs in search_kwargs]
+
+
+def _write_ops(
+    store: BaseStore,
+    puts: list[dict],
+    deletes: list[tuple[tuple[str, ...], str]],
+) -> list[PutOp]:
+    """Collect puts and deletes into a single batch of store operations.
+
+    Deletes are expressed as PutOps with a `None` value. Puts get the store's
+    default TTL and namespace validation, as they would through `BaseStore.put`.
+    """
+    for ns in {tuple(put["namespace"]) for put in puts}:
+        _validate_namespace(ns)
+    ttl_config = getattr(store, "ttl_config", None)
+    default_ttl = ttl_config.get("default_ttl") if ttl_config else None
+    # Only pass `ttl` when set: older langgraph-checkpoint PutOps have no such field.
+    ttl = {} if default_ttl is None else {"ttl": default_ttl}
+    return [
+        PutOp(put["namespace"], put["key"], put["value"], **ttl) for put in puts
+    ] + [PutOp(ns, key, None) for (ns, key) in deletes]
+
+
 class MemoryStoreManager(Runnable[MemoryStoreManagerInput, list[dict]]):
     def __init__(
         self,
@@ -802,24 +927,19 @@ class MemoryStoreManager(Runnable[MemoryStoreManagerInput, list[dict]]):
         store: BaseStore | None = None,
         phases: list[MemoryPhase] | None = None,
     ):
-        self.model = (
-            model if isinstance(model, BaseChatModel) else init_chat_model(model)
-        )
-        self.query_model = (
-            None
-            if query_model is None
-            else (
-                query_model
-                if isinstance(query_model, BaseChatModel)
-                else init_chat_model(query_model)
-            )
-        )
+        self.model = model if isinstance(model, BaseChatModel) else _get_model(model)
+        if query_model is None or isinstance(query_model, BaseChatModel):
+            self.query_model = query_model
+        else:
+            self.query_model = _get_model(query_model)
         self.schemas = schemas
         self.instructions = instructions
         self.enable_inserts = enable_inserts
         self.enable_deletes = enable_deletes
         self.query_limit = query_limit
         self.phases = phases or []
+        self._phase_groups = self._group_phases(self.phases)
+        self._phase_managers: dict[tuple[str, bool, bool], MemoryManager] = {}
         self.namespace = utils.NamespaceTemplate(namespace)
         self.store = store
 
@@ -839,6 +959,8 @@ class MemoryStoreManager(Runnable[MemoryStoreManagerInput, list[dict]]):
             self.query_gen = self.query_model.bind_tools(
                 [self.search_tool], tool_choice="any"
             )
+        # Query-generation calls in flight, keyed by a digest of the prompt.
+        self._query_inflight: dict[bytes, asyncio.Task] = {}
 
     def _get_store(self) -> BaseStore:
         """Get the store to use for memory storage.
@@ -851,59 +973,156 @@ class MemoryStoreManager(Runnable[MemoryStoreManagerInput, list[dict]]):
         return get_store()
 
     @staticmethod
-    def _stable_id(item: SearchItem) -> str:
-        return uuid.uuid5(uuid.NAMESPACE_DNS, str((*item.namespace, item.key))).hex
+    @functools.lru_cache(maxsize=4096)
+    def _stable_id(namespace: tuple[str, ...], key: str) -> str:
+        return uuid.uuid5(uuid.NAMESPACE_DNS, str((*namespace, key))).hex
 
     @staticmethod
     def _apply_manager_output(
         manager_output: list[ExtractedMemory],
-        store_based: list[tuple[str, str, dict]],
+        store_dict: dict[str, tuple[str, str, dict]],
         store_map: dict[str, SearchItem],
-        ephemeral: list[tuple[str, str, dict]],
-    ) -> tuple[list[tuple[str, str, dict]], list[tuple[str, str, dict]], list[str]]:
-        store_dict = {sid: (sid, kind, content) for (sid, kind, content) in store_based}
-        ephemeral_dict = {
-            sid: (sid, kind, content) for (sid, kind, content) in ephemeral
-        }
+        ephemeral_dict: dict[str, tuple[str, str, dict]],
+    ) -> list[str]:
+        """Fold a manager's output into `store_dict` and `ephemeral_dict` in place.
+
+        Returns the ids of the memories that the manager removed, whether stored
+        or inserted earlier in the same update.
+        """
         removed_ids = []
-        for extracted in manager_output:
-            stable_id = extracted.id
-            model_data = extracted.content
+        for stable_id, model_data in manager_output:
             if isinstance(model_data, BaseModel):
                 if (
                     hasattr(model_data, "__repr_name__")
-                    and model_data.__repr_name__() == "RemoveDoc"
+                    and type(model_data).__name__ == "RemoveDoc"
                 ):
                     removal_id = getattr(model_data, "json_doc_id", None)
-                    if removal_id and removal_id in store_map:
+                    if removal_id:
                         removed_ids.append(removal_id)
                     store_dict.pop(removal_id, None)
                     ephemeral_dict.pop(removal_id, None)
                     continue
                 new_content = model_data.model_dump(mode="json")
-                new_kind = model_data.__repr_name__()
+                new_kind = type(model_data).__name__
             else:
-                new_kind = store_dict.get(stable_id, (stable_id, "Memory", {}))[1]
+                current = store_dict.get(stable_id)
+                new_kind = "Memory" if current is None else current[1]
                 new_content = model_data
             if stable_id in store_dict:
                 store_dict[stable_id] = (stable_id, new_kind, new_content)
             else:
                 ephemeral_dict[stable_id] = (stable_id, new_kind, new_content)
-        return list(store_dict.values()), list(ephemeral_dict.values()), removed_ids
+        return removed_ids
 
     def _build_phase_manager(
         self, phase: MemoryPhase
     ) -> Runnable[MessagesState, list[ExtractedMemory]]:
-        return create_memory_manager(
-            self.model,
-            schemas=self.schemas,
-            instructions=phase.get(
+        key = (
+            phase.get(
                 "instructions",
                 "You are a memory manager. Deduplicate, consolidate, and enrich these memories.",
             ),
-            enable_inserts=phase.get("enable_inserts", True),
-            enable_deletes=phase.get("enable_deletes", True),
+            phase.get("enable_inserts", True),
+            phase.get("enable_deletes", True),
         )
+        if key not in self._phase_managers:
+            instructions, enable_inserts, enable_deletes = key
+            self._phase_managers[key] = create_memory_manager(
+                self.model,
+                schemas=self.schemas,
+                instructions=instructions,
+                enable_inserts=enable_inserts,
+                enable_deletes=enable_deletes,
+            )
+        return self._phase_managers[key]
+
+    @staticmethod
+    def _group_phases(phases: list[MemoryPhase]) -> list[list[MemoryPhase]]:
+        """Group consecutive parallel phases so each group can run concurrently."""
+        groups: list[list[MemoryPhase]] = []
+        for phase in phases:
+            if (
+                phase.get("parallel", False)
+                and groups
+                and groups[-1][-1].get("parallel", False)
+            ):
+                groups[-1].append(phase)
+            else:
+                groups.append([phase])
+        return groups
+
+    def _apply_group_output(
+        self,
+        group_outputs: list[list[ExtractedMemory]],
+        existing: list[tuple[str, str, dict]],
+        store_dict: dict[str, tuple[str, str, dict]],
+        store_map: dict[str, SearchItem],
+        ephemeral_dict: dict[str, tuple[str, str, dict]],
+        removed_ids: set[str],
+    ) -> None:
+        """Fold the outputs of a phase group, in phase order, updating `removed_ids`.
+
+        Sibling phases see the same snapshot, so memories a phase returned
+        untouched are skipped, and a removal by any phase wins over a sibling's
+        update to the same memory.
+        """
+        for output in group_outputs:
+            if len(group_outputs) > 1:
+                output = [
+                    extracted
+                    for extracted in self._changed_memories(output, existing)
+                    if extracted.id not in removed_ids
+                ]
+            removed_ids.update(
+                self._apply_manager_output(
+                    output, store_dict, store_map, ephemeral_dict
+                )
+            )
+
+    @staticmethod
+    def _changed_memories(
+        manager_output: list[ExtractedMemory],
+        existing: list[tuple[str, str, dict]],
+    ) -> list[ExtractedMemory]:
+        """Drop memories a phase returned untouched.
+
+        Phases in the same group see the same snapshot, so re-applying an untouched
+        memory would clobber an update made by a sibling phase.
+        """
+        snapshot = {sid: content for sid, _, content in existing}
+        return [
+            extracted
+            for extracted in manager_output
+            if snapshot.get(extracted.id) is not extracted.content
+        ]
+
+    async def _agenerate_queries(self, query_text: str) -> AIMessage:
+        """Generate search queries, sharing one model call across identical prompts.
+
+        Concurrent updates over the same conversation (e.g., when batch-evaluating)
+        await the same in-flight request instead of each calling the query model.
+        """
+        key = hashlib.blake2b(query_text.encode(), digest_size=16).digest()
+        task = self._query_inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self.query_gen.ainvoke(query_text))
+            self._query_inflight[key] = task
+
+            def _forget(done: asyncio.Task) -> None:
+                if self._query_inflight.get(key) is done:
+                    del self._query_inflight[key]
+
+            task.add_done_callback(_forget)
+        # Shield so one cancelled caller doesn't cancel the request for the others.
+        return await asyncio.shield(task)
+
+    def _search_kwargs(self, tool_calls: list[ToolCall]) -> list[dict]:
+        """Search arguments for each distinct search the query model requested."""
+        unique: dict[str, dict] = {}
+        for tc in tool_calls:
+            kwargs = {**tc["args"], "limit": self.query_limit}
+            unique.setdefault(json.dumps(kwargs, sort_keys=True, default=str), kwargs)
+        return list(unique.values())
 
     @staticmethod
     def _sort_results(
@@ -913,12 +1132,69 @@ class MemoryStoreManager(Runnable[MemoryStoreManagerInput, list[dict]]):
         for results in search_results_lists:
             for item in results:
                 search_results[(tuple(item.namespace), item.key)] = item
-        sorted_results = sorted(
+        top_results = heapq.nlargest(
+            query_limit,
             search_results.values(),
             key=lambda it: it.score if it.score is not None else float("-inf"),
-            reverse=True,
-        )[:query_limit]
-        return {MemoryStoreManager._stable_id(item): item for item in sorted_results}
+        )
+        return {
+            MemoryStoreManager._stable_id(tuple(item.namespace), item.key): item
+            for item in top_results
+        }
+
+    @staticmethod
+    def _stored_memories(
+        store_map: dict[str, SearchItem],
+    ) -> dict[str, tuple[str, str, dict]]:
+        """Unpack searched items into (id, kind, content) memories keyed by id."""
+        memories = {}
+        for sid, item in store_map.items():
+            value = item.value
+            memories[sid] = (sid, value["kind"], value["content"])
+        return memories
+
+    @staticmethod
+    def _plan_writes(
+        store_dict: dict[str, tuple[str, str, dict]],
+        ephemeral_dict: dict[str, tuple[str, str, dict]],
+        store_map: dict[str, SearchItem],
+        removed_ids: set[str],
+        namespace: tuple[str, ...],
+    ) -> tuple[list[dict], list[tuple[tuple[str, ...], str]]]:
+        """Diff the final memories against the store into puts and deletes.
+
+        Each (namespace, key) gets at most one op: stored memories are keyed by
+        their stable id, new ones by a fresh id, and removed ids are never put.
+        """
+
+        def unchanged(old_art: SearchItem, kind: str, content: typing.Any) -> bool:
+            old = old_art.value
+            # Untouched memories still hold the stored object; skip the deep compare.
+            return old["kind"] == kind and (
+                content is old["content"] or content == old["content"]
+            )
+
+        final_puts = [
+            {
+                "namespace": namespace if old_art is None else old_art.namespace,
+                "key": sid if old_art is None else old_art.key,
+                "value": {"kind": kind, "content": content},
+            }
+            for sid, kind, content in itertools.chain(
+                store_dict.values(), ephemeral_dict.values()
+            )
+            if sid not in removed_ids
+            and (
+                (old_art := store_map.get(sid)) is None
+                or not unchanged(old_art, kind, content)
+            )
+        ]
+        final_deletes = [
+            (art.namespace, art.key)
+            for sid in removed_ids
+            if (art := store_map.get(sid)) is not None
+        ]
+        return final_puts, final_deletes
 
     async def ainvoke(
         self,
@@ -928,6 +1204,8 @@ class MemoryStoreManager(Runnable[MemoryStoreManagerInput, list[dict]]):
     ) -> list[dict]:
         store = self._get_store()
         namespace = self.namespace(config)
+        max_concurrency = (config or {}).get("max_concurrency")
+        max_concurrency = max_concurrency or _DEFAULT_MAX_CONCURRENCY
 
         if self.query_gen:
             convo = utils.get_conversation(input["messages"])
@@ -935,97 +1213,84 @@ class MemoryStoreManager(Runnable[MemoryStoreManagerInput, list[dict]]):
                 f"Use parallel tool calling to search for distinct memories relevant to this conversation.:\n\n"
                 f"<convo>\n{convo}\n</convo>."
             )
-            query_req = await self.query_gen.ainvoke(query_text)
-            search_results_lists = await asyncio.gather(
+            query_req = await self._agenerate_queries(query_text)
+            search_results_lists = await gather_with_concurrency(
+                max_concurrency,
                 *[
-                    store.asearch(
-                        namespace, **({**tc["args"], "limit": self.query_limit})
-                    )
-                    for tc in query_req.tool_calls
-                ]
+                    _search_or_error(store.asearch(namespace, **kwargs))
+                    for kwargs in self._search_kwargs(query_req.tool_calls)
+                ],
             )
         else:
             # Search over "query_limit" timespans starting from the most recent
             queries = utils.get_dialated_windows(
                 input["messages"], self.query_limit // 4
             )
-            search_results_lists = await asyncio.gather(
-                *[store.asearch(namespace, query=query) for query in queries]
+            search_results_lists = await gather_with_concurrency(
+                max_concurrency,
+                *[
+                    _search_or_error(store.asearch(namespace, query=query))
+                    for query in queries
+                ],
             )
 
-        store_map = self._sort_results(search_results_lists, self.query_limit)
+        store_map = self._sort_results(
+            _drop_failed_searches(search_results_lists), self.query_limit
+        )
 
-        store_based = [
-            (sid, item.value["kind"], item.value["content"])
-            for sid, item in store_map.items()
-        ]
-        ephemeral: list[tuple[str, str, dict]] = []
+        store_dict = self._stored_memories(store_map)
+        ephemeral_dict: dict[str, tuple[str, str, dict]] = {}
         removed_ids: set[str] = set()
 
         # --- Enrich memories using the composed MemoryManager (async) ---
+        # This can't be overlapped with the search above: the manager must see the
+        # retrieved memories to patch or remove them instead of inserting duplicates.
         enriched = await self.memory_manager.ainvoke(
             {
                 "messages": input["messages"],
-                "existing": store_based,
+                "existing": list(store_dict.values()),
                 "max_steps": input.get("max_steps"),
             }
         )
-        store_based, ephemeral, removed = self._apply_manager_output(
-            enriched, store_based, store_map, ephemeral
+        removed_ids.update(
+            self._apply_manager_output(enriched, store_dict, store_map, ephemeral_dict)
         )
-        removed_ids.update(removed)
 
-        # Process additional phases.
-        for phase in self.phases:
-            phase_manager = self._build_phase_manager(phase)
-            phase_messages = (
-                input["messages"] if phase.get("include_messages", False) else []
-            )
-            phase_input = {
-                "messages": phase_messages,
-                "existing": store_based + ephemeral,
-            }
-            phase_enriched = await phase_manager.ainvoke(phase_input)
-            store_based, ephemeral, removed = self._apply_manager_output(
-                phase_enriched, store_based, store_map, ephemeral
-            )
-            removed_ids.update(removed)
-
-        final_mem = store_based + ephemeral
-        final_puts = []
-        for sid, kind, content in final_mem:
-            if sid in removed_ids:
-                continue
-            if sid in store_map:
-                old_art = store_map[sid]
-                if old_art.value["kind"] != kind or old_art.value["content"] != content:
-                    final_puts.append(
+        # Process additional phases; phases within a group run concurrently.
+        for group in self._phase_groups:
+            existing = [*store_dict.values(), *ephemeral_dict.values()]
+            group_enriched = await gather_with_concurrency(
+                max_concurrency,
+                *(
+                    self._build_phase_manager(phase).ainvoke(
                         {
-                            "namespace": old_art.namespace,
-                            "key": old_art.key,
-                            "value": {"kind": kind, "content": content},
+                            "messages": (
+                                input["messages"]
+                                if phase.get("include_messages", False)
+                                else []
+                            ),
+                            "existing": existing,
                         }
                     )
-            else:
-                final_puts.append(
-                    {
-                        "namespace": namespace,
-                        "key": sid,
-                        "value": {"kind": kind, "content": content},
-                    }
-                )
-
-        final_deletes = []
-        for sid in removed_ids:
-            if sid in store_map:
-                art = store_map[sid]
-                final_deletes.append((art.namespace, art.key))
+                    for phase in group
+                ),
+            )
+            self._apply_group_output(
+                group_enriched,
+                existing,
+                store_dict,
+                store_map,
+                ephemeral_dict,
+                removed_ids,
+            )
 
-        await asyncio.gather(
-            *(store.aput(**put) for put in final_puts),
-            *(store.adelete(ns, key) for (ns, key) in final_deletes),
+        final_puts, final_deletes = self._plan_writes(
+            store_dict, ephemeral_dict, store_map, removed_ids, namespace
         )
 
+        if final_puts or final_deletes:
+            await store.abatch(_write_ops(store, final_puts, final_deletes))
+
         return final_puts
 
     def invoke(
@@ -1036,113 +1301,78 @@ class MemoryStoreManager(Runnable[MemoryStoreManagerInput, list[dict]]):
     ) -> list[dict]:
         store = self._get_store()
         namespace = self.namespace(config)
-        convo = utils.get_conversation(input["messages"])
-
-        with get_executor_for_config(config) as executor:
-            if self.query_gen:
-                convo = utils.get_conversation(input["messages"])
-                query_text = (
-                    f"Use parallel tool calling to search for distinct memories relevant to this conversation.:\n\n"
-                    f"<convo>\n{convo}\n</convo>."
-                )
-                query_req = self.query_gen.invoke(query_text)
-                search_results_futs = [
-                    executor.submit(
-                        store.search,
-                        namespace,
-                        **({**tc["args"], "limit": self.query_limit}),
-                    )
-                    for tc in query_req.tool_calls
-                ]
-            else:
-                # Search over "query_limit" timespans starting from the most recent
-                queries = utils.get_dialated_windows(
-                    input["messages"], self.query_limit // 4
-                )
-                search_results_lists = [
-                    store.search(namespace, query=query) for query in queries
-                ]
-                search_results_futs = [
-                    executor.submit(
-                        store.search,
-                        namespace,
-                        query=query,
-                        limit=self.query_limit,
-                    )
-                    for query in queries
-                ]
 
-        search_results_lists = [fut.result() for fut in search_results_futs]
+        if self.query_gen:
+            convo = utils.get_conversation(input["messages"])
+            query_text = (
+                f"Use parallel tool calling to search for distinct memories relevant to this conversation.:\n\n"
+                f"<convo>\n{convo}\n</convo>."
+            )
+            query_req = self.query_gen.invoke(query_text)
+            search_kwargs = self._search_kwargs(query_req.tool_calls)
+        else:
+            # Search over "query_limit" timespans starting from the most recent
+            queries = utils.get_dialated_windows(
+                input["messages"], self.query_limit // 4
+            )
+            search_kwargs = [
+                {"query": query, "limit": self.query_limit} for query in queries
+            ]
+
+        search_results_lists = _batch_searches(
+            store, _search_ops(store, namespace, search_kwargs)
+        )
         store_map = self._sort_results(search_results_lists, self.query_limit)
-        store_based = [
-            (sid, item.value["kind"], item.value["content"])
-            for sid, item in store_map.items()
-        ]
-        ephemeral: list[tuple[str, str, dict]] = []
+        store_dict = self._stored_memories(store_map)
+        ephemeral_dict: dict[str, tuple[str, str, dict]] = {}
         removed_ids: set[str] = set()
 
         enriched = self.memory_manager.invoke(
             {
                 "messages": input["messages"],
-                "existing": store_based,
+                "existing": list(store_dict.values()),
                 "max_steps": input.get("max_steps"),
             }
         )
-        store_based, ephemeral, removed = self._apply_manager_output(
-            enriched, store_based, store_map, ephemeral
+        removed_ids.update(
+            self._apply_manager_output(enriched, store_dict, store_map, ephemeral_dict)
         )
-        removed_ids.update(removed)
 
-        for phase in self.phases:
-            phase_manager = self._build_phase_manager(phase)
-            phase_messages = (
-                input["messages"] if phase.get("include_messages", False) else []
-            )
-            phase_input = {
-                "messages": phase_messages,
-                "existing": store_based + ephemeral,
-            }
-            phase_enriched = phase_manager.invoke(phase_input)
-            store_based, ephemeral, removed = self._apply_manager_output(
-                phase_enriched, store_based, store_map, ephemeral
-            )
-            removed_ids.update(removed)
-
-        final_mem = store_based + ephemeral
-        final_puts = []
-        for sid, kind, content in final_mem:
-            if sid in removed_ids:
-                continue
-            if sid in store_map:
-                old_art = store_map[sid]
-                if old_art.value["kind"] != kind or old_art.value["content"] != content:
-                    final_puts.append(
-                        {
-                            "namespace": old_art.namespace,
-                            "key": old_art.key,
-                            "value": {"kind": kind, "content": content},
-                        }
-                    )
-            else:
-                final_puts.append(
+        for group in self._phase_groups:
+            existing = [*store_dict.values(), *ephemeral_dict.values()]
+
+            def run_phase(phase: MemoryPhase) -> list[ExtractedMemory]:
+                return self._build_phase_manager(phase).invoke(
                     {
-                        "namespace": namespace,
-                        "key": sid,
-                        "value": {"kind": kind, "content": content},
+                        "messages": (
+                            input["messages"]
+                            if phase.get("include_messages", False)
+                            else []
+                        ),
+                        "existing": existing,
                     }
                 )
 
-        final_deletes = []
-        for sid in removed_ids:
-            if sid in store_map:
-                art = store_map[sid]
-                final_deletes.append((art.namespace, art.key))
+            if len(group) > 1:
+                with get_executor_for_config(config) as executor:
+                    group_enriched = list(executor.map(run_phase, group))
+            else:
+                group_enriched = [run_phase(group[0])]
+            self._apply_group_output(
+                group_enriched,
+                existing,
+                store_dict,
+                store_map,
+                ephemeral_dict,
+                removed_ids,
+            )
+
+        final_puts, final_deletes = self._plan_writes(
+            store_dict, ephemeral_dict, store_map, removed_ids, namespace
+        )
 
-        with get_executor_for_config(config) as executor:
-            for put in final_puts:
-                executor.submit(store.put, **put)
-            for ns, key in final_deletes:
-                executor.submit(store.delete, ns, key)
+        if final_puts or final_deletes:
+            store.batch(_write_ops(store, final_puts, final_deletes))
 
         return final_puts
 
@@ -1150,6 +1380,49 @@ class MemoryStoreManager(Runnable[MemoryStoreManagerInput, list[dict]]):
         return await self.ainvoke({"messages": messages})
 
 
+_UNCACHEABLE = object()
+
+
+def _cache_key(value: typing.Any) -> typing.Hashable:
+    """Hashable content key for a factory argument.
+
+    Returns `_UNCACHEABLE` for model and store instances (anything that isn't
+    plain data or a schema class): caching a manager built from them would keep
+    the caller's objects alive and share them with every other caller.
+    """
+    if value is None or isinstance(value, (str, int, float, type)):
+        return value
+    if isinstance(value, (list, tuple)):
+        keys = tuple(_cache_key(v) for v in value)
+        return _UNCACHEABLE if _UNCACHEABLE in keys else keys
+    if isinstance(value, dict):
+        return json.dumps(value, sort_keys=True, default=repr)
+    return _UNCACHEABLE
+
+
+class _ManagerSpec:
+    """Constructor arguments for a MemoryStoreManager, hashed by `_cache_key`."""
+
+    __slots__ = ("args", "kwargs", "key")
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any):
+        self.args = args
+        self.kwargs = kwargs
+        self.key = _cache_key([*args, *sorted(kwargs.items())])
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _ManagerSpec) and self.key == other.key
+
+
+@functools.lru_cache(maxsize=32)
+def _build_memory_store_manager(spec: _ManagerSpec) -> MemoryStoreManager:
+    # Call `_build_memory_store_manager.cache_clear()` to drop cached managers.
+    return MemoryStoreManager(*spec.args, **spec.kwargs)
+
+
 def create_memory_store_manager(
     model: str | BaseChatModel,
     /,
@@ -1169,6 +1442,10 @@ def create_memory_store_manager(
     The system automatically searches for relevant memories, extracts new information,
     updates existing memories, and maintains a versioned history of all changes.
 
+    Managers configured only by value (model names, no `store`) are cached, so
+    calling this again with the same configuration returns the existing instance.
+    Passing a model or store instance always builds a new manager.
+
     Args:
         model (Union[str, BaseChatModel]): The primary language model to use for memory
             enrichment. Can be a model name string or a BaseChatModel instance.
@@ -1195,6 +1472,8 @@ def create_memory_store_manager(
             If None, uses the store configured in the LangGraph config. Defaults to None.
             When using LangGraph Platform, the server will manage the store for you.
         phases (Optional[list]): List of MemoryPhase objects defining the phases of the memory enrichment process.
+            Consecutive phases with `parallel=True` run concurrently against the same snapshot of memories,
+            and their updates are applied in the order the phases are listed.
 
     Returns:
         manager: An runnable that processes conversations and automatically manages memories in the LangGraph BaseStore.
@@ -1465,7 +1744,7 @@ def create_memory_store_manager(
         print(store.search(("memories", "user-123")))
         ```
     """
-    return MemoryStoreManager(
+    spec = _ManagerSpec(
         model,
         schemas=schemas,
         instructions=instructions,
@@ -1477,6 +1756,9 @@ def create_memory_store_manager(
         store=store,
         phases=phases,
     )
+    if spec.key is _UNCACHEABLE:
+        return MemoryStoreManager(*spec.args, **spec.kwargs)
+    return _build_memory_store_manager(spec)
 
 
 __all__ = [
@@ -64,30 +64,30 @@ class NamespaceTemplate:
 
         self.template = template if isinstance(template, tuple) else (template,)
         self.vars = {
-            ix: _get_key(ns)
+            ix: key
             for ix, ns in enumerate(self.template)
-            if _get_key(ns) is not None
+            if (key := _get_key(ns)) is not None
         }
 
     def __call__(self, config: RunnableConfig | None = None):
+        if not self.vars:
+            # Fixed namespaces don't need the config (or the context lookup).
+            return self.template
         try:
             config = config or get_config()
         except RuntimeError:
             config = {}
-        if self.vars:
-            configurable = config["configurable"] if "configurable" in config else {}
-            try:
-                return tuple(
-                    configurable[self.vars[ix]] if ix in self.vars else ns  # type: ignore
-                    for ix, ns in enumerate(self.template)
-                )
-            except KeyError as e:
-                raise errors.ConfigurationError(
-                    f"Missing key in 'configurable' field: {e.args[0]}."
-                    f" Available keys: {list(configurable.keys())}"
-                )
-        else:
-            return self.template
+        configurable = config["configurable"] if "configurable" in config else {}
+        try:
+            return tuple(
+                configurable[self.vars[ix]] if ix in self.vars else ns  # type: ignore
+                for ix, ns in enumerate(self.template)
+            )
+        except KeyError as e:
+            raise errors.ConfigurationError(
+                f"Missing key in 'configurable' field: {e.args[0]}."
+                f" Available keys: {list(configurable.keys())}"
+            )
 
 
 def _get_key(ns: str):
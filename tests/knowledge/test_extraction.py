@@ -0,0 +1,574 @@
+import asyncio
+import typing
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.store.base import InvalidNamespaceError, PutOp, SearchItem
+from langgraph.store.memory import InMemoryStore
+from pydantic import BaseModel
+
+from langmem import create_memory_store_manager, create_thread_extractor
+from langmem.knowledge import extraction
+from langmem.knowledge.extraction import (
+    ExtractedMemory,
+    MemoryStoreManager,
+    _build_memory_store_manager,
+    _search_ops,
+    _write_ops,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_manager_cache():
+    yield
+    _build_memory_store_manager.cache_clear()
+
+
+class FakeToolCallingModel(BaseChatModel):
+    """Mock chat model that replays predefined tool-calling responses."""
+
+    responses: list[AIMessage]
+    i: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-tool-calling"
+
+    def bind_tools(self, tools, **kwargs):
+        """Mock bind_tools method that ignores the tools."""
+        return self.bind(**kwargs)
+
+    def _next_result(self) -> ChatResult:
+        response = self.responses[self.i % len(self.responses)]
+        self.i += 1
+        return ChatResult(generations=[ChatGeneration(message=response)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._next_result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._next_result()
+
+
+def tool_call(name: str, args: dict, id: str = "call_1") -> AIMessage:
+    return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": id}])
+
+
+@pytest.mark.anyio
+async def test_store_manager_ainvoke_never_calls_sync_apis():
+    store = InMemoryStore()
+    store.put(
+        ("memories", "user-1"),
+        "pref",
+        {"kind": "Memory", "content": {"content": "User likes sushi"}},
+    )
+    manager = create_memory_store_manager(
+        FakeToolCallingModel(
+            responses=[tool_call("Memory", {"content": "User likes ramen"})]
+        ),
+        query_model=FakeToolCallingModel(
+            responses=[tool_call("search_memory", {"query": "food preferences"})]
+        ),
+        namespace=("memories", "{user_id}"),
+        store=store,
+    )
+
+    with (
+        patch.object(FakeToolCallingModel, "_generate") as sync_generate,
+        patch.object(InMemoryStore, "batch") as sync_batch,
+    ):
+        puts = await manager.ainvoke(
+            {"messages": [{"role": "user", "content": "I like ramen too"}]},
+            config={"configurable": {"user_id": "user-1"}},
+        )
+
+    # Blocking model or store calls would stall the event loop
+    sync_generate.assert_not_called()
+    sync_batch.assert_not_called()
+    assert [put["value"]["content"] for put in puts] == [
+        {"content": "User likes ramen"}
+    ]
+    assert sorted(
+        item.value["content"]["content"]
+        for item in store.search(("memories", "user-1"))
+    ) == ["User likes ramen", "User likes sushi"]
+
+
+@pytest.mark.anyio
+async def test_store_manager_skips_duplicate_searches():
+    store = InMemoryStore()
+    query = {"query": "food preferences"}
+    manager = create_memory_store_manager(
+        FakeToolCallingModel(
+            responses=[tool_call("Memory", {"content": "User likes ramen"})]
+        ),
+        query_model=FakeToolCallingModel(
+            responses=[
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {"name": "search_memory", "args": query, "id": "call_1"},
+                        {"name": "search_memory", "args": query, "id": "call_2"},
+                        {
+                            "name": "search_memory",
+                            "args": {"query": "diet"},
+                            "id": "call_3",
+                        },
+                    ],
+                )
+            ]
+        ),
+        namespace=("memories", "user-1"),
+        store=store,
+    )
+
+    with patch.object(InMemoryStore, "asearch", return_value=[]) as asearch:
+        await manager.ainvoke(
+            {"messages": [{"role": "user", "content": "I like ramen"}]}
+        )
+
+    assert sorted(call.kwargs["query"] for call in asearch.call_args_list) == [
+        "diet",
+        "food preferences",
+    ]
+
+
+@pytest.mark.anyio
+async def test_store_manager_tolerates_partial_search_failures():
+    store = InMemoryStore()
+    manager = create_memory_store_manager(
+        FakeToolCallingModel(
+            responses=[tool_call("Memory", {"content": "User likes ramen"})]
+        ),
+        query_model=FakeToolCallingModel(
+            responses=[
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {"name": "search_memory", "args": {"query": "food"}, "id": "1"},
+                        {"name": "search_memory", "args": {"query": "diet"}, "id": "2"},
+                    ],
+                )
+            ]
+        ),
+        namespace=("memories", "user-1"),
+        store=store,
+    )
+
+    async def flaky_search(namespace, *, query=None, **kwargs):
+        if query == "diet":
+            raise ConnectionError("search backend unavailable")
+        return []
+
+    with patch.object(InMemoryStore, "asearch", side_effect=flaky_search):
+        puts = await manager.ainvoke(
+            {"messages": [{"role": "user", "content": "I like ramen"}]}
+        )
+    assert [put["value"]["content"] for put in puts] == [
+        {"content": "User likes ramen"}
+    ]
+
+    with (
+        patch.object(InMemoryStore, "asearch", side_effect=ConnectionError("down")),
+        pytest.raises(ConnectionError),
+    ):
+        await manager.ainvoke(
+            {"messages": [{"role": "user", "content": "I like ramen"}]}
+        )
+
+
+@pytest.mark.anyio
+async def test_store_manager_coalesces_concurrent_query_generation():
+    query_model = FakeToolCallingModel(
+        responses=[tool_call("search_memory", {"query": "food preferences"})]
+    )
+    manager = create_memory_store_manager(
+        FakeToolCallingModel(
+            responses=[tool_call("Memory", {"content": "User likes ramen"})]
+        ),
+        query_model=query_model,
+        namespace=("memories", "user-1"),
+        store=InMemoryStore(),
+    )
+    messages = [{"role": "user", "content": "I like ramen"}]
+
+    await asyncio.gather(*(manager.ainvoke({"messages": messages}) for _ in range(3)))
+
+    assert query_model.i == 1
+    assert not manager._query_inflight
+
+
+def test_store_manager_invoke_writes_in_one_batch():
+    store = InMemoryStore()
+    store.put(
+        ("memories", "user-1"),
+        "pref",
+        {"kind": "Memory", "content": {"content": "User likes sushi"}},
+    )
+    manager = create_memory_store_manager(
+        FakeToolCallingModel(
+            responses=[
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {
+                            "name": "Memory",
+                            "args": {"content": "User likes ramen"},
+                            "id": "call_1",
+                        },
+                        {
+                            "name": "Memory",
+                            "args": {"content": "User likes udon"},
+                            "id": "call_2",
+                        },
+                    ],
+                )
+            ]
+        ),
+        query_model=None,
+        namespace=("memories", "user-1"),
+        store=store,
+    )
+
+    with (
+        patch.object(InMemoryStore, "batch", wraps=store.batch) as batch,
+        patch.object(InMemoryStore, "put") as put,
+    ):
+        puts = manager.invoke(
+            {"messages": [{"role": "user", "content": "I like ramen and udon"}]}
+        )
+
+    put.assert_not_called()
+    write_batches = [
+        ops
+        for (ops,), _ in batch.call_args_list
+        if any(isinstance(op, PutOp) for op in ops)
+    ]
+    assert len(write_batches) == 1
+    assert len(puts) == 2
+    assert sorted(
+        item.value["content"]["content"]
+        for item in store.search(("memories", "user-1"))
+    ) == ["User likes ramen", "User likes sushi", "User likes udon"]
+
+
+def test_create_memory_store_manager_caches_by_value(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+    def create(model="openai:gpt-4o-mini", **kwargs):
+        return create_memory_store_manager(
+            model,
+            schemas=[{"title": "Fact", "properties": {"fact": {"type": "string"}}}],
+            namespace=("memories", "{user_id}"),
+            **kwargs,
+        )
+
+    manager = create()
+    assert create() is manager
+    assert create(query_limit=10) is not manager
+
+    # Caller-owned objects are never cached (or kept alive by the cache)
+    store = InMemoryStore()
+    assert create(store=store) is not create(store=store)
+    model = FakeToolCallingModel(responses=[])
+    assert create(model) is not create(model)
+
+
+class RemoveDoc(BaseModel):
+    """Stand-in for trustcall's removal schema, which is matched by name."""
+
+    json_doc_id: str
+
+
+def stored_item(key: str, content: dict) -> SearchItem:
+    now = datetime.now(timezone.utc)
+    return SearchItem(
+        ("memories", "user-1"),
+        key,
+        {"kind": "Memory", "content": content},
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_group_phases():
+    a, b, c, d = (
+        {"instructions": "a", "parallel": True},
+        {"instructions": "b", "parallel": True},
+        {"instructions": "c"},
+        {"instructions": "d", "parallel": True},
+    )
+    assert MemoryStoreManager._group_phases([a, b, c, d]) == [[a, b], [c], [d]]
+    assert MemoryStoreManager._group_phases([c, a, c]) == [[c], [a], [c]]
+    assert MemoryStoreManager._group_phases([]) == []
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("use_async", [True, False])
+async def test_store_manager_parallel_phases_each_insert(use_async: bool):
+    store = InMemoryStore()
+    manager = create_memory_store_manager(
+        FakeToolCallingModel(
+            responses=[
+                tool_call("Memory", {"content": "User likes ramen"}),
+                tool_call("Memory", {"content": "User likes udon"}),
+                tool_call("Memory", {"content": "User likes sushi"}),
+            ]
+        ),
+        query_model=None,
+        namespace=("memories", "user-1"),
+        store=store,
+        phases=[
+            {"instructions": "Find food preferences.", "parallel": True},
+            {"instructions": "Find more food preferences.", "parallel": True},
+        ],
+    )
+    input = {"messages": [{"role": "user", "content": "I like noodles and fish"}]}
+
+    puts = await manager.ainvoke(input) if use_async else manager.invoke(input)
+
+    expected = ["User likes ramen", "User likes sushi", "User likes udon"]
+    assert sorted(put["value"]["content"]["content"] for put in puts) == expected
+    assert (
+        sorted(
+            item.value["content"]["content"]
+            for item in store.search(("memories", "user-1"))
+        )
+        == expected
+    )
+
+
+def fold_group(outputs, store_map, ephemeral_dict=None):
+    manager = MemoryStoreManager(FakeToolCallingModel(responses=[]))
+    store_dict = {
+        sid: (sid, item.value["kind"], item.value["content"])
+        for sid, item in store_map.items()
+    }
+    ephemeral_dict = dict(ephemeral_dict or {})
+    existing = [*store_dict.values(), *ephemeral_dict.values()]
+    removed_ids: set[str] = set()
+    manager._apply_group_output(
+        outputs, existing, store_dict, store_map, ephemeral_dict, removed_ids
+    )
+    return manager._plan_writes(
+        store_dict, ephemeral_dict, store_map, removed_ids, ("memories", "user-1")
+    )
+
+
+@pytest.mark.parametrize("updater_first", [True, False])
+def test_phase_group_keeps_update_when_sibling_returns_memory_untouched(
+    updater_first: bool,
+):
+    item = stored_item("k1", {"content": "User likes sushi"})
+    updated = ExtractedMemory("k1", {"content": "User likes ramen"})
+    untouched = ExtractedMemory("k1", item.value["content"])
+    outputs = [[updated], [untouched]]
+    if not updater_first:
+        outputs.reverse()
+
+    puts, deletes = fold_group(outputs, {"k1": item})
+
+    assert [(put["key"], put["value"]["content"]) for put in puts] == [
+        ("k1", {"content": "User likes ramen"})
+    ]
+    assert deletes == []
+
+
+@pytest.mark.parametrize("remover_first", [True, False])
+def test_phase_group_removal_wins_over_sibling_update(remover_first: bool):
+    item = stored_item("k1", {"content": "User likes sushi"})
+    outputs = [
+        [
+            ExtractedMemory("r1", RemoveDoc(json_doc_id="k1")),
+            ExtractedMemory("r2", RemoveDoc(json_doc_id="new")),
+        ],
+        [
+            ExtractedMemory("k1", {"content": "User likes ramen"}),
+            ExtractedMemory("new", {"content": "User likes udon a lot"}),
+        ],
+    ]
+    if not remover_first:
+        outputs.reverse()
+
+    puts, deletes = fold_group(
+        outputs,
+        {"k1": item},
+        ephemeral_dict={"new": ("new", "Memory", {"content": "User likes udon"})},
+    )
+
+    assert puts == []
+    assert deletes == [(("memories", "user-1"), "k1")]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("use_async", [True, False])
+async def test_store_manager_rejects_invalid_namespace(use_async: bool):
+    store = InMemoryStore()
+    manager = create_memory_store_manager(
+        FakeToolCallingModel(
+            responses=[tool_call("Memory", {"content": "User likes ramen"})]
+        ),
+        query_model=None,
+        namespace=("memories", "{user_id}"),
+        store=store,
+    )
+    input = {"messages": [{"role": "user", "content": "I like ramen"}]}
+    config = {"configurable": {"user_id": "a.b@x.com"}}
+
+    with pytest.raises(InvalidNamespaceError):
+        if use_async:
+            await manager.ainvoke(input, config=config)
+        else:
+            manager.invoke(input, config=config)
+    assert store.search(("memories",)) == []
+
+
+def test_store_manager_invoke_tolerates_partial_search_failures():
+    store = InMemoryStore()
+    manager = create_memory_store_manager(
+        FakeToolCallingModel(
+            responses=[tool_call("Memory", {"content": "User likes ramen"})]
+        ),
+        query_model=FakeToolCallingModel(
+            responses=[
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {"name": "search_memory", "args": {"query": "food"}, "id": "1"},
+                        {"name": "search_memory", "args": {"query": "diet"}, "id": "2"},
+                    ],
+                )
+            ]
+        ),
+        namespace=("memories", "user-1"),
+        store=store,
+    )
+    batch = store.batch
+
+    def flaky_batch(ops):
+        if any(getattr(op, "query", None) == "diet" for op in ops):
+            raise ConnectionError("search backend unavailable")
+        return batch(ops)
+
+    with patch.object(InMemoryStore, "batch", side_effect=flaky_batch):
+        puts = manager.invoke(
+            {"messages": [{"role": "user", "content": "I like ramen"}]}
+        )
+    assert [put["value"]["content"] for put in puts] == [
+        {"content": "User likes ramen"}
+    ]
+
+
+@pytest.mark.anyio
+async def test_store_manager_search_programming_errors_propagate():
+    manager = create_memory_store_manager(
+        FakeToolCallingModel(
+            responses=[tool_call("Memory", {"content": "User likes ramen"})]
+        ),
+        query_model=FakeToolCallingModel(
+            responses=[
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {"name": "search_memory", "args": {"query": "food"}, "id": "1"},
+                        {"name": "search_memory", "args": {"query": "diet"}, "id": "2"},
+                    ],
+                )
+            ]
+        ),
+        namespace=("memories", "user-1"),
+        store=InMemoryStore(),
+    )
+
+    async def buggy_search(namespace, *, query=None, **kwargs):
+        if query == "diet":
+            raise TypeError("unexpected keyword argument")
+        return []
+
+    with (
+        patch.object(InMemoryStore, "asearch", side_effect=buggy_search),
+        pytest.raises(TypeError),
+    ):
+        await manager.ainvoke(
+            {"messages": [{"role": "user", "content": "I like ramen"}]}
+        )
+
+
+class LegacyPutOp(typing.NamedTuple):
+    """PutOp as shipped by langgraph-checkpoint 2.0.12, before item TTLs."""
+
+    namespace: tuple[str, ...]
+    key: str
+    value: typing.Optional[dict]
+    index: typing.Any = None
+
+
+class LegacySearchOp(typing.NamedTuple):
+    """SearchOp as shipped by langgraph-checkpoint 2.0.12, before item TTLs."""
+
+    namespace_prefix: tuple[str, ...]
+    filter: typing.Optional[dict] = None
+    limit: int = 10
+    offset: int = 0
+    query: typing.Optional[str] = None
+
+
+class TTLStore(InMemoryStore):
+    ttl_config = {"default_ttl": 5, "refresh_on_read": False}
+
+
+def test_write_ops_only_pass_ttl_when_store_sets_one(monkeypatch):
+    puts = [{"namespace": ("memories",), "key": "k", "value": {"kind": "Memory"}}]
+    deletes = [(("memories",), "gone")]
+
+    assert [op.ttl for op in _write_ops(TTLStore(), puts, deletes)] == [5, None]
+
+    monkeypatch.setattr(extraction, "PutOp", LegacyPutOp)
+    assert _write_ops(InMemoryStore(), puts, deletes) == [
+        LegacyPutOp(("memories",), "k", {"kind": "Memory"}),
+        LegacyPutOp(("memories",), "gone", None),
+    ]
+
+
+def test_search_ops_only_pass_refresh_ttl_when_store_has_ttl_config(monkeypatch):
+    searches = [{"query": "food", "limit": 5}]
+
+    assert [op.refresh_ttl for op in _search_ops(TTLStore(), ("m",), searches)] == [
+        False
+    ]
+
+    monkeypatch.setattr(extraction, "SearchOp", LegacySearchOp)
+    assert _search_ops(InMemoryStore(), ("m",), searches) == [
+        LegacySearchOp(("m",), query="food", limit=5)
+    ]
+
+
+def test_thread_extractor_formats_instruction_variables():
+    seen = []
+
+    class RecordingModel(FakeToolCallingModel):
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            seen.append(messages[0].content)
+            return super()._generate(messages, stop, run_manager, **kwargs)
+
+    model = RecordingModel(
+        responses=[tool_call("SummarizeThread", {"title": "t", "summary": "s"})]
+    )
+    messages = [{"role": "user", "content": "I like {ramen}"}]
+
+    create_thread_extractor(model, instructions="Summarize: {conversation}").invoke(
+        {"messages": messages}
+    )
+    create_thread_extractor(
+        model, instructions="Summarize for {user} in {{braces}}"
+    ).invoke({"messages": messages, "user": "Ann"})
+    create_thread_extractor(model, instructions="Just {{summarize}}").invoke(
+        {"messages": messages}
+    )
+
+    assert "I like {ramen}" in seen[0] and seen[0].startswith("Summarize: ")
+    assert seen[1:] == ["Summarize for Ann in {braces}", "Just {summarize}"]